@@ -1,13 +1,16 @@
 """Base service interfaces for the router."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 from uuid import UUID
 
 from pydantic import EmailStr
 
 from schema import (
+    ChatRequest,
     ChatResponse,
+    ChatResponseChunk,
     GenerationOptions,
     Message,
     SearchOptions,
@@ -23,7 +26,7 @@ class ChatService(ABC):
         self.config = config
 
     @abstractmethod
-    def generate_chat(
+    async def generate_chat(
         self,
         model: str,
         messages: List[Message],
@@ -34,6 +37,46 @@ class ChatService(ABC):
         """Generate a chat response based on conversation history."""
         pass
 
+    def generate_chat_stream(
+        self,
+        model: str,
+        messages: List[Message],
+        user_email: EmailStr,
+        transaction_token: Optional[str] = None,
+        options: Optional[GenerationOptions] = None,
+    ) -> AsyncIterator[ChatResponseChunk]:
+        """Stream a chat response as content chunks."""
+        raise NotImplementedError("Streaming is not supported by this chat service")
+
+    async def generate_chat_many(
+        self, requests: List[ChatRequest]
+    ) -> List[Union[ChatResponse, BaseException]]:
+        """Generate chat responses for many requests concurrently.
+
+        At most `config.max_concurrency` requests are in flight at once.
+        Results keep the order of `requests`; a failed request yields its
+        exception instead of a response.
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def _one(request: ChatRequest) -> ChatResponse:
+            async with semaphore:
+                return await self.generate_chat(
+                    model=request.model,
+                    messages=request.messages,
+                    user_email=request.user_email,
+                    transaction_token=request.transaction_token,
+                    options=request.options,
+                )
+
+        return await asyncio.gather(
+            *(_one(request) for request in requests), return_exceptions=True
+        )
+
+    async def aclose(self) -> None:
+        """Release any resources held by the service."""
+        pass
+
 
 class SearchService(ABC):
     """Abstract interface for document retrieval services."""
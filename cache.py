@@ -0,0 +1,188 @@
+"""Response caches for the chat service."""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from cachetools import TTLCache
+
+
+class LLMCache:
+    """Exact-match cache for deterministic chat completions.
+
+    Entries are evicted least-recently-used once `maxsize` is reached and
+    expire after `ttl_seconds`.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 3600):
+        self._backend = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_cacheable(temperature: Optional[float]) -> bool:
+        """Only greedy (temperature 0 or unset) generations are cached."""
+        return temperature in (None, 0)
+
+    @staticmethod
+    def cache_key(model: str, messages: list[dict], **params: Any) -> str:
+        """Build a stable key from the model, messages and sampling params."""
+        raw = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, if any."""
+        value = self._backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key`."""
+        self._backend[key] = value
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._backend)}
+
+
+# Prompts whose answer depends on when they are asked are never served from
+# the semantic cache
+TIME_SENSITIVE_PATTERN = re.compile(
+    r"\b(now|today|tonight|tomorrow|yesterday|current(ly)?|latest|this (week|month|year))\b",
+    re.IGNORECASE,
+)
+
+
+class SemanticCache:
+    """Similarity cache that serves near-duplicate prompts.
+
+    Prompts are embedded with a sentence-transformers model and matched with
+    an inner-product FAISS index over normalized vectors. Each index holds
+    one `namespace`, e.g. the model, the sampling parameters and the
+    conversation context that shape the reply, so answers are never shared
+    across different settings or conversations. At most `maxsize` entries
+    are kept across all namespaces. Requires the optional `semantic-cache`
+    dependencies.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        maxsize: int = 10_000,
+    ):
+        try:
+            import faiss
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Semantic cache requires the 'semantic-cache' extra: "
+                "pip install -e .[semantic-cache]"
+            ) from e
+
+        self._faiss = faiss
+        self._np = np
+        self._encoder = SentenceTransformer(model_name)
+        self._dimension = self._encoder.get_sentence_embedding_dimension()
+        self.threshold = threshold
+        self.maxsize = maxsize
+
+        # Per-namespace index and the responses stored under each vector id
+        self._indexes: dict[Hashable, Any] = {}
+        self._store: dict[Hashable, dict[int, Any]] = {}
+        # Namespace of every vector id, oldest first, for global eviction
+        self._order: OrderedDict[int, Hashable] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def split_prompt(messages: list[dict]) -> Optional[tuple[str, str]]:
+        """Split a conversation into a context digest and the text to embed.
+
+        Only the final user message is embedded; the system prompt(s) and
+        all earlier turns are hashed so they can be matched exactly as part
+        of the namespace. Returns None when the prompt should bypass the
+        cache.
+        """
+        if not messages or messages[-1]["role"] != "user":
+            return None
+        text = messages[-1]["content"]
+        if TIME_SENSITIVE_PATTERN.search(text):
+            return None
+        context = json.dumps(messages[:-1], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(context.encode()).hexdigest(), text
+
+    def _embed(self, text: str):
+        vector = self._encoder.encode([text], normalize_embeddings=True)
+        return self._np.asarray(vector, dtype="float32")
+
+    def lookup(self, namespace: Hashable, text: str) -> tuple[Optional[Any], Any]:
+        """Return the closest cached response above the threshold.
+
+        Also returns the prompt embedding so a miss can be stored without
+        encoding the text twice.
+        """
+        vector = self._embed(text)
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is not None and index.ntotal > 0:
+                scores, ids = index.search(vector, 1)
+                if scores[0][0] >= self.threshold:
+                    self.hits += 1
+                    return self._store[namespace][int(ids[0][0])], vector
+            self.misses += 1
+        return None, vector
+
+    def add(self, namespace: Hashable, vector, value: Any) -> None:
+        """Store `value` for the prompt embedded as `vector`."""
+        with self._lock:
+            if namespace not in self._indexes:
+                self._indexes[namespace] = self._faiss.IndexIDMap2(
+                    self._faiss.IndexFlatIP(self._dimension)
+                )
+                self._store[namespace] = {}
+            index, store = self._indexes[namespace], self._store[namespace]
+
+            vector_id = self._next_id
+            self._next_id += 1
+            index.add_with_ids(vector, self._np.array([vector_id], dtype="int64"))
+            store[vector_id] = value
+            self._order[vector_id] = namespace
+
+            # Evict the oldest entries once the cache is full, dropping
+            # namespaces that become empty along with their index
+            while len(self._order) > self.maxsize:
+                oldest_id, oldest_namespace = self._order.popitem(last=False)
+                oldest_store = self._store[oldest_namespace]
+                del oldest_store[oldest_id]
+                if oldest_store:
+                    self._indexes[oldest_namespace].remove_ids(
+                        self._np.array([oldest_id], dtype="int64")
+                    )
+                else:
+                    del self._store[oldest_namespace]
+                    del self._indexes[oldest_namespace]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._order),
+            "namespaces": len(self._indexes),
+        }
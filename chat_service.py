@@ -1,15 +1,29 @@
 """Chat service implementation using Claude."""
 
+import asyncio
 import os
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 from uuid import uuid4
 
-import requests
+import httpx
+import msgspec
+import orjson
 from loguru import logger
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from tenacity.wait import wait_base
 
 from base_services import ChatService
+from cache import LLMCache, SemanticCache
 from schema import (
     ChatResponse,
+    ChatResponseChunk,
     GenerationOptions,
     Message,
     ChatUsage,
@@ -19,9 +33,146 @@ from schema import (
 )
 from config import RouterConfig
 from pydantic import EmailStr
+from rate_limiter import RateLimiter, retry_after_seconds
 from syft_accounting_sdk import UserClient
 
 
+# Connection pool limits for the OpenRouter client
+OPENROUTER_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Timeouts in seconds for OpenRouter requests
+OPENROUTER_TIMEOUT = httpx.Timeout(60.0, connect=3.05)
+
+# Client-side limits kept just below the OpenRouter quota
+OPENROUTER_REQUESTS_PER_MINUTE = 200
+OPENROUTER_TOKENS_PER_MINUTE = 400_000
+OPENROUTER_MAX_CONCURRENCY = 32
+
+# Map of allowed model names to full OpenRouter model names
+_MODEL_MAP = {
+    "claude": "anthropic/claude-3-sonnet",
+    "claude-3-opus": "anthropic/claude-3-opus",
+    "claude-3-sonnet": "anthropic/claude-3-sonnet",
+    "claude-3-haiku": "anthropic/claude-3-haiku",
+    "anthropic/claude-3-opus": "anthropic/claude-3-opus",
+    "anthropic/claude-3-sonnet": "anthropic/claude-3-sonnet",
+    "anthropic/claude-3-haiku": "anthropic/claude-3-haiku",
+}
+ALLOWED_MODELS = frozenset(_MODEL_MAP)
+
+# Model used when the requested one is not allowed
+DEFAULT_MODEL = "claude-3-sonnet"
+
+# Map of OpenRouter finish reasons to our FinishReason enum
+_FINISH_MAP = {
+    "stop": FinishReason.STOP,
+    "length": FinishReason.LENGTH,
+    "content_filter": FinishReason.CONTENT_FILTER,
+}
+
+# OpenRouter role names for our Role enum
+_ROLE_STR = {role: role.value.lower() for role in Role}
+
+# Default number of tokens to generate
+DEFAULT_MAX_TOKENS = 1000
+
+# Rough number of characters per token used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# Prefix of data lines in OpenRouter's server-sent event stream
+SSE_DATA_PREFIX = "data: "
+
+
+class _Usage(msgspec.Struct):
+    """Token usage as returned by OpenRouter."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+class _Msg(msgspec.Struct):
+    """Generated message as returned by OpenRouter."""
+
+    content: Optional[str] = None
+
+
+class _Choice(msgspec.Struct):
+    """A completion choice as returned by OpenRouter."""
+
+    message: _Msg = msgspec.field(default_factory=_Msg)
+    finish_reason: Optional[str] = None
+
+
+class _Resp(msgspec.Struct):
+    """Chat completion response body, restricted to the fields we read."""
+
+    choices: list[_Choice] = msgspec.field(default_factory=list)
+    usage: _Usage = msgspec.field(default_factory=_Usage)
+
+
+# Typed decoder for the hot path; unknown fields are skipped without
+# being materialized
+_RESPONSE_DECODER = msgspec.json.Decoder(_Resp)
+
+
+# Upstream statuses worth retrying
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Whether a failed OpenRouter call is transient and can be retried."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+class _wait_retry_after(wait_base):
+    """Wait as long as the provider's Retry-After asks, at least `fallback`."""
+
+    def __init__(self, fallback: wait_base):
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        delay = self.fallback(retry_state)
+        exc = retry_state.outcome.exception()
+        if isinstance(exc, httpx.HTTPStatusError):
+            retry_after = retry_after_seconds(exc.response.headers)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a failed OpenRouter attempt before sleeping."""
+    logger.warning(
+        "OpenRouter request failed (attempt {}): {}; retrying in {:.1f}s",
+        retry_state.attempt_number,
+        retry_state.outcome.exception(),
+        retry_state.next_action.sleep,
+    )
+
+
+def _to_openrouter_messages(
+    messages: List[Message], _role_str: dict = _ROLE_STR
+) -> list[dict]:
+    """Convert our Message objects to OpenRouter message dicts.
+
+    The role table is bound as a default so the per-message lookup is a
+    local rather than a global access.
+    """
+    return [
+        {"role": _role_str[message.role], "content": message.content}
+        for message in messages
+    ]
+
+
+def _estimate_tokens(payload: dict) -> int:
+    """Estimate the tokens a request will consume (prompt + completion)."""
+    prompt_chars = sum(len(message["content"]) for message in payload["messages"])
+    return prompt_chars // CHARS_PER_TOKEN + payload.get("max_tokens", DEFAULT_MAX_TOKENS)
+
+
 class CustomChatService(ChatService):
     """Claude-sonnet-3.5 service implementation."""
 
@@ -36,26 +187,39 @@ class CustomChatService(ChatService):
             raise ValueError("OpenRouter API key is required. Set OPENROUTER_API_KEY environment variable or pass api_key parameter.")
             
         self.base_url = "https://openrouter.ai/api/v1"
-        self.allowed_models = [
-            "claude-3-opus", 
-            "claude-3-sonnet", 
-            "claude-3-haiku", 
-            "claude",
-            "anthropic/claude-3-opus",
-            "anthropic/claude-3-sonnet", 
-            "anthropic/claude-3-haiku"
-        ]
+        self.allowed_models = ALLOWED_MODELS
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
             "X-Title": "Router"
         }
 
+        # Reuse a single async client so keep-alive connections and TLS sessions
+        # are shared across concurrent chat requests without blocking the event loop
+        self._aclient = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=OPENROUTER_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(retries=3, limits=OPENROUTER_LIMITS),
+        )
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=OPENROUTER_REQUESTS_PER_MINUTE,
+            tokens_per_minute=OPENROUTER_TOKENS_PER_MINUTE,
+            max_concurrency=OPENROUTER_MAX_CONCURRENCY,
+        )
+        self.cache = LLMCache()
+        self.semantic_cache: Optional[SemanticCache] = (
+            SemanticCache() if self.config.enable_semantic_cache else None
+        )
+
         self.accounting_client: UserClient = self.config.accounting_client()
-        logger.info(f"Initialized accounting client: {self.accounting_client}")
+        logger.info("Initialized accounting client: {}", self.accounting_client)
 
         self.app_name = self.config.project.name
 
+        # (metadata mtime, pricing) of the last parsed metadata file
+        self._pricing_cache: Optional[tuple[int, Optional[float]]] = None
+
 
     def _validate_model(self, model: str) -> str:
         """Validate that the model is allowed and return the full model name.
@@ -69,27 +233,15 @@ class CustomChatService(ChatService):
         Raises:
             ValueError: If the model is not allowed.
         """
-        # if model not in self.allowed_models:
-        #     allowed_models_str = ", ".join(self.allowed_models)
-        #     raise ValueError(
-        #         f"Model '{model}' is not allowed. Allowed models: {allowed_models_str}"
-        #     )
-        # Default to claude-3-sonnet
-        if model not in self.allowed_models:
-            logger.warning(f"Model '{model}' is not allowed, defaulting to 'claude-3-sonnet'.")
-            model = "claude-3-sonnet"
-
-        # Map short names to full OpenRouter model names
-        model_mapping = {
-            "claude": "anthropic/claude-3-sonnet",
-            "claude-3-opus": "anthropic/claude-3-opus",
-            "claude-3-sonnet": "anthropic/claude-3-sonnet",
-            "claude-3-haiku": "anthropic/claude-3-haiku"
-        }
-
-        return model_mapping.get(model, model)
-
-    def _map_finish_reason(self, finish_reason: str) -> FinishReason:
+        full_model_name = _MODEL_MAP.get(model)
+        if full_model_name is None:
+            # Default to claude-3-sonnet
+            logger.warning("Model '{}' is not allowed, defaulting to '{}'.", model, DEFAULT_MODEL)
+            full_model_name = _MODEL_MAP[DEFAULT_MODEL]
+        return full_model_name
+
+    @staticmethod
+    def _map_finish_reason(finish_reason: str) -> FinishReason:
         """Map OpenRouter finish reason to our FinishReason enum.
 
         Args:
@@ -98,21 +250,146 @@ class CustomChatService(ChatService):
         Returns:
             The corresponding FinishReason enum value.
         """
-        mapping = {
-            "stop": FinishReason.STOP,
-            "length": FinishReason.LENGTH,
-            "content_filter": FinishReason.CONTENT_FILTER,
-        }
-        return mapping.get(finish_reason, None)
+        return _FINISH_MAP.get(finish_reason, None)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._aclient.aclose()
+
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        wait=_wait_retry_after(wait_exponential_jitter(initial=1, max=30)),
+        stop=stop_after_attempt(5),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+    async def _post(self, body: bytes, estimated_tokens: int) -> httpx.Response:
+        """POST a serialized chat request, retrying transient failures.
+
+        429 and 5xx responses and transport errors are retried with jittered
+        exponential backoff, waiting at least as long as Retry-After asks.
+        A 429 also pauses the rate limiter so concurrent callers back off.
+        """
+        async with self.rate_limiter.acquire(estimated_tokens):
+            response = await self._aclient.post("/chat/completions", content=body)
+        if response.status_code == 429:
+            delay = retry_after_seconds(response.headers)
+            if delay:
+                self.rate_limiter.pause(delay)
+        response.raise_for_status()
+        return response
 
-    def __make_chat_request(self, payload: dict) -> str:
+    async def __make_chat_request(self, payload: dict) -> _Resp:
         """Make a chat request to OpenRouter."""
-        url = f"{self.base_url}/chat/completions"
-        response = requests.post(url, headers=self.headers, json=payload)
-        response.raise_for_status()
-        return response.json()
+        # Serialize once; the same body is reused across retries
+        response = await self._post(orjson.dumps(payload), _estimate_tokens(payload))
+        return _RESPONSE_DECODER.decode(response.content)
 
-    def generate_chat(
+    async def __stream_chat_request(self, payload: dict) -> AsyncIterator[dict]:
+        """Stream a chat request to OpenRouter, yielding each SSE frame.
+
+        Stops at the `[DONE]` sentinel and raises if the connection closes
+        before it. Streams are not retried, since part of the completion may
+        already have been forwarded to the caller.
+        """
+        estimated_tokens = _estimate_tokens(payload)
+        async with self.rate_limiter.acquire(estimated_tokens):
+            async with self._aclient.stream(
+                "POST", "/chat/completions", content=orjson.dumps(payload)
+            ) as response:
+                if response.status_code == 429:
+                    delay = retry_after_seconds(response.headers)
+                    if delay:
+                        self.rate_limiter.pause(delay)
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    # Skip blank separators and keep-alive comments
+                    if not line.startswith(SSE_DATA_PREFIX):
+                        continue
+                    data = line[len(SSE_DATA_PREFIX):]
+                    if data == "[DONE]":
+                        return
+                    frame = orjson.loads(data)
+                    if "error" in frame:
+                        raise ValueError(f"OpenRouter stream failed: {frame['error']}")
+                    yield frame
+
+        raise ValueError("OpenRouter stream ended before [DONE]")
+
+    @asynccontextmanager
+    async def _delegated_transfer(
+        self, user_email: EmailStr, transaction_token: str
+    ) -> AsyncIterator:
+        """Open an accounting transfer without blocking the event loop.
+
+        The accounting SDK only exposes a synchronous context manager, so its
+        enter and exit calls are run in a worker thread; callers do the same
+        for `payment_txn.confirm()`.
+        """
+        transfer = self.accounting_client.delegated_transfer(
+            user_email,
+            amount=self.pricing,
+            token=transaction_token,
+            app_name=self.app_name,
+            app_ep_path="/chat",
+        )
+        payment_txn = await asyncio.to_thread(transfer.__enter__)
+        try:
+            yield payment_txn
+        except BaseException as e:
+            if not await asyncio.to_thread(
+                transfer.__exit__, type(e), e, e.__traceback__
+            ):
+                raise
+        else:
+            await asyncio.to_thread(transfer.__exit__, None, None, None)
+
+    async def _charge_cached(
+        self, user_email: EmailStr, transaction_token: str
+    ) -> float:
+        """Charge for a response served from a cache and return the cost.
+
+        Cache hits only save the upstream call; the user still pays the
+        service price and the transaction token is verified as usual.
+        """
+        async with self._delegated_transfer(
+            user_email, transaction_token
+        ) as payment_txn:
+            await asyncio.to_thread(payment_txn.confirm)
+        return self.pricing
+
+    @staticmethod
+    def _build_payload(
+        full_model_name: str,
+        messages: List[Message],
+        options: Optional[GenerationOptions] = None,
+    ) -> dict:
+        """Build the OpenRouter chat completions request payload."""
+        # Convert our Message objects to OpenRouter format
+        openrouter_messages = _to_openrouter_messages(messages)
+
+        # Prepare the request payload
+        payload = {
+            "model": full_model_name,
+            "messages": openrouter_messages,
+            "max_tokens": DEFAULT_MAX_TOKENS,
+        }
+    
+        # Add options if provided
+        if options:
+            if options.max_tokens is not None:
+                payload["max_tokens"] = options.max_tokens
+            if options.temperature is not None:
+                payload["temperature"] = options.temperature
+            if options.top_p is not None:
+                payload["top_p"] = options.top_p
+            if options.stop_sequences is not None:
+                payload["stop"] = options.stop_sequences
+
+        return payload
+
+    async def generate_chat(
         self,
         model: str,
         messages: List[Message],
@@ -124,131 +401,240 @@ class CustomChatService(ChatService):
         try:
             full_model_name = self._validate_model(model)
 
-            # Convert our Message objects to OpenRouter format
-            openrouter_messages = []
-            for message in messages:
-                openrouter_message = {
-                    "role": message.role.value.lower(),
-                    "content": message.content,
-                }
-                openrouter_messages.append(openrouter_message)
-
-            # Prepare the request payload
-            payload = {
-                "model": full_model_name,
-                "messages": openrouter_messages,
-                "max_tokens": 1000,  # Default max tokens
-            }
-        
-            # Add options if provided
-            if options:
-                if options.max_tokens is not None:
-                    payload["max_tokens"] = options.max_tokens
-                if options.temperature is not None:
-                    payload["temperature"] = options.temperature
-                if options.top_p is not None:
-                    payload["top_p"] = options.top_p
-                if options.stop_sequences is not None:
-                    payload["stop"] = options.stop_sequences
+            payload = self._build_payload(full_model_name, messages, options)
 
             # Initialize query cost to 0.0
             query_cost = 0.0
 
-            # Add generation options if provided
-            if options:
-                if options.temperature is not None:
-                    payload["temperature"] = options.temperature
-                if options.top_p is not None:
-                    payload["top_p"] = options.top_p
-                if options.max_tokens is not None:
-                    payload["num_predict"] = options.max_tokens
-                if options.stop_sequences:
-                    payload["stop"] = options.stop_sequences
+            # Paid services require a transaction token, even for cached responses
+            if self.pricing > 0 and not transaction_token:
+                raise ValueError(
+                    "Transaction token is required for paid services. Please provide a transaction token."
+                )
 
-            if self.pricing > 0 and transaction_token:
+            # Deterministic requests are served from the cache when possible
+            content = None
+            cache_key = None
+            if self.cache.is_cacheable(payload.get("temperature")):
+                cache_key = self.cache.cache_key(**payload)
+                content = self.cache.get(cache_key)
+            cache_hit = content is not None
+
+            # Near-duplicate prompts are served from the semantic cache
+            semantic_prompt = None
+            semantic_vector = None
+            semantic_namespace = None
+            if (
+                not cache_hit
+                and cache_key is not None
+                and self.semantic_cache is not None
+            ):
+                semantic_prompt = self.semantic_cache.split_prompt(payload["messages"])
+            if semantic_prompt is not None:
+                context_digest, semantic_text = semantic_prompt
+                # Replies are only shared between requests with the same
+                # model, sampling parameters and conversation so far, so a
+                # reply truncated by max_tokens or stop, or one answering a
+                # different conversation, is never served to another request
+                semantic_namespace = (
+                    full_model_name,
+                    payload["max_tokens"],
+                    payload.get("temperature"),
+                    payload.get("top_p"),
+                    tuple(payload.get("stop") or ()),
+                    context_digest,
+                )
+                cached_response, semantic_vector = await asyncio.to_thread(
+                    self.semantic_cache.lookup, semantic_namespace, semantic_text
+                )
+                if cached_response is not None:
+                    logger.opt(lazy=True).debug(
+                        "Semantic cache hit: {}", lambda: self.semantic_cache.stats
+                    )
+                    if self.pricing > 0:
+                        query_cost = await self._charge_cached(
+                            user_email, transaction_token
+                        )
+                    return cached_response.model_copy(
+                        update={"id": uuid4(), "model": model, "cost": query_cost}
+                    )
+
+            if cache_hit:
+                logger.opt(lazy=True).debug("Chat cache hit: {}", lambda: self.cache.stats)
+                if self.pricing > 0:
+                    query_cost = await self._charge_cached(
+                        user_email, transaction_token
+                    )
+
+            elif self.pricing > 0 and transaction_token:
                 # If pricing is not zero, then we need to create a transaction
-                with self.accounting_client.delegated_transfer(
-                    user_email,
-                    amount=self.pricing,
-                    token=transaction_token,
-                    app_name=self.app_name,
-                    app_ep_path="/chat",
+                async with self._delegated_transfer(
+                    user_email, transaction_token
                 ) as payment_txn:
                     # Make request to Ollama
-                    content = self.__make_chat_request(payload)
+                    content = await self.__make_chat_request(payload)
 
                     # If the response is not empty, confirm the transaction
-                    if content:
-                        payment_txn.confirm()
+                    if content.choices:
+                        await asyncio.to_thread(payment_txn.confirm)
                         query_cost = self.pricing
 
-            elif self.pricing > 0 and not transaction_token:
-                # If pricing is not zero, but transaction token is not provided, then we raise an error
-                raise ValueError(
-                    "Transaction token is required for paid services. Please provide a transaction token."
-                )
-
             else:
                 # If pricing is zero, then we make a request to Ollama without creating a transaction
                 # We don't need to create a transaction because the service is free
                 # Make request to Ollama
-                content = self.__make_chat_request(payload)
+                content = await self.__make_chat_request(payload)
+
+            if cache_key is not None and not cache_hit and content.choices:
+                self.cache.set(cache_key, content)
 
-            
-            # Parse the response
-            response_data = content
-                
             # Extract usage information
-            usage_data = response_data.get("usage", {})
-            usage = ChatUsage(
-                prompt_tokens=usage_data.get("prompt_tokens", 0),
-                completion_tokens=usage_data.get("completion_tokens", 0),
-                total_tokens=usage_data.get("total_tokens", 0),
+            # The decoded response is already typed, so the public models are
+            # built without re-running Pydantic validation
+            usage_data = content.usage
+            usage = ChatUsage.model_construct(
+                prompt_tokens=usage_data.prompt_tokens,
+                completion_tokens=usage_data.completion_tokens,
+                total_tokens=usage_data.total_tokens,
             )
 
             # Extract the generated message and other information
-            choices = response_data.get("choices", [{}])
-            choice = choices[0] if choices else {}
-            message_data = choice.get("message", {})
-            
+            choice = content.choices[0] if content.choices else _Choice()
+
             # Create the Message object
-            generated_message = Message(
+            generated_message = Message.model_construct(
                 role=Role.ASSISTANT,
-                content=message_data.get("content", ""),
+                content=choice.message.content or "",
             )
 
-
             # Get finish reason
-            finish_reason_str = choice.get("finish_reason")
+            finish_reason_str = choice.finish_reason
             finish_reason = (
                 self._map_finish_reason(finish_reason_str) if finish_reason_str else None
             )
 
-            return ChatResponse(
+            response = ChatResponse.model_construct(
                 id=uuid4(),
                 model=model,
                 message=generated_message,
-                finish_reason=finish_reason,                usage=usage,
+                finish_reason=finish_reason,
+                usage=usage,
                 provider_info={"provider": "ollama", "model": model},
                 cost=query_cost,
             )
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Claude API request failed: {e}")
+            if semantic_vector is not None:
+                self.semantic_cache.add(semantic_namespace, semantic_vector, response)
+
+            return response
+
+        except httpx.HTTPError as e:
+            logger.error("Claude API request failed: {}", e)
             raise e
         except Exception as e:
-            logger.error(f"Unexpected error in chat generation: {e}")
+            logger.error("Unexpected error in chat generation: {}", e)
+            raise e
+
+    async def generate_chat_stream(
+        self,
+        model: str,
+        messages: List[Message],
+        user_email: EmailStr,
+        transaction_token: Optional[str] = None,
+        options: Optional[GenerationOptions] = None,
+    ) -> AsyncIterator[ChatResponseChunk]:
+        """Stream a chat response as content chunks.
+
+        The last chunk carries the finish reason, usage and cost. Paid requests
+        are only confirmed once the upstream stream has completed.
+        """
+        full_model_name = self._validate_model(model)
+        payload = self._build_payload(full_model_name, messages, options)
+        payload["stream"] = True
+
+        response_id = uuid4()
+        state = {"usage": {}, "finish_reason": None, "received": False, "done": False}
+
+        async def _content_chunks() -> AsyncIterator[ChatResponseChunk]:
+            async for frame in self.__stream_chat_request(payload):
+                if frame.get("usage"):
+                    state["usage"] = frame["usage"]
+                choices = frame.get("choices") or [{}]
+                choice = choices[0]
+                if choice.get("finish_reason"):
+                    state["finish_reason"] = choice["finish_reason"]
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    state["received"] = True
+                    yield ChatResponseChunk.model_construct(
+                        id=response_id, model=model, delta=delta
+                    )
+            # Only reached once the upstream sent [DONE]
+            state["done"] = True
+
+        try:
+            query_cost = 0.0
+            if self.pricing > 0 and transaction_token:
+                # If pricing is not zero, then we need to create a transaction
+                async with self._delegated_transfer(
+                    user_email, transaction_token
+                ) as payment_txn:
+                    async for chunk in _content_chunks():
+                        yield chunk
+
+                    # Only charge once the full completion has been streamed
+                    if state["done"] and state["received"]:
+                        await asyncio.to_thread(payment_txn.confirm)
+                        query_cost = self.pricing
+
+            elif self.pricing > 0 and not transaction_token:
+                # If pricing is not zero, but transaction token is not provided, then we raise an error
+                raise ValueError(
+                    "Transaction token is required for paid services. Please provide a transaction token."
+                )
+
+            else:
+                async for chunk in _content_chunks():
+                    yield chunk
+
+            usage_data = state["usage"]
+            finish_reason_str = state["finish_reason"]
+            yield ChatResponseChunk(
+                id=response_id,
+                model=model,
+                finish_reason=(
+                    self._map_finish_reason(finish_reason_str) if finish_reason_str else None
+                ),
+                usage=ChatUsage(
+                    prompt_tokens=usage_data.get("prompt_tokens", 0),
+                    completion_tokens=usage_data.get("completion_tokens", 0),
+                    total_tokens=usage_data.get("total_tokens", 0),
+                ),
+                cost=query_cost,
+            )
+
+        except httpx.HTTPError as e:
+            logger.error("Claude API streaming request failed: {}", e)
             raise e
 
     @property
     def pricing(self) -> float:
-        """Get the pricing for the chat service."""
-        if not self.config.metadata_path.exists():
+        """Get the pricing for the chat service.
+
+        The metadata file is only re-parsed when its modification time changes.
+        """
+        try:
+            mtime = os.stat(self.config.metadata_path).st_mtime_ns
+        except FileNotFoundError:
             return 0.0
+        if self._pricing_cache is not None and self._pricing_cache[0] == mtime:
+            return self._pricing_cache[1]
+
         metadata = PublishedMetadata.from_path(self.config.metadata_path)
-        for service in metadata.services:
-            if service.type == RouterServiceType.CHAT:
-                return service.pricing
+        service = metadata.services_by_type.get(RouterServiceType.CHAT)
+        pricing = service.pricing if service else None
+        self._pricing_cache = (mtime, pricing)
+        return pricing
 
 
 ChatServiceImpl = CustomChatService
@@ -8,7 +8,7 @@ import json
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, PrivateAttr, field_validator
 from syft_accounting_sdk import UserClient
 from syft_core.config import SyftClientConfig
 from pydantic_settings import BaseSettings
@@ -18,6 +18,8 @@ class RouterEnvSettings(BaseSettings):
     project_name: str = Field(..., env="PROJECT_NAME")
     enable_chat: bool = Field(..., env="ENABLE_CHAT")
     enable_search: bool = Field(..., env="ENABLE_SEARCH")
+    enable_semantic_cache: bool = Field(False, env="ENABLE_SEMANTIC_CACHE")
+    max_concurrency: int = Field(8, env="MAX_CONCURRENCY")
     accounting_url: str = Field(..., env="ACCOUNTING_URL")
     accounting_email: EmailStr = Field(..., env="ACCOUNTING_EMAIL")
     accounting_password: str = Field("changethis", env="ACCOUNTING_PASSWORD")
@@ -89,6 +91,12 @@ class RouterConfiguration(BaseModel):
 
     enable_chat: bool = Field(default=True, description="Enable chat service")
     enable_search: bool = Field(default=True, description="Enable search service")
+    enable_semantic_cache: bool = Field(
+        default=False, description="Enable semantic cache for chat responses"
+    )
+    max_concurrency: int = Field(
+        default=8, ge=1, description="Maximum concurrent requests in a chat batch"
+    )
 
 
 class AccountingConfig(BaseModel):
@@ -126,6 +134,14 @@ class StateFile(BaseModel):
                 setattr(current_state, key, value)
         self.save()
 
+    def bulk_update_services(self, **kwargs):
+        """Update the state of all services and save once."""
+        for service_state in self.services.values():
+            for key, value in kwargs.items():
+                if hasattr(service_state, key):
+                    setattr(service_state, key, value)
+        self.save()
+
     def update_router_state(self, **kwargs):
         """Update the state of the router."""
         for key, value in kwargs.items():
@@ -155,6 +171,9 @@ class RouterConfig(BaseModel):
     syft_config: SyftClientConfig
     metadata_path: Path
 
+    # Accounting client shared by all services, created on first use
+    _accounting_client: Optional[UserClient] = PrivateAttr(default=None)
+
     @property
     def project_name(self) -> str:
         return self.project.name
@@ -167,6 +186,14 @@ class RouterConfig(BaseModel):
     def enable_search(self) -> bool:
         return self.configuration.enable_search
 
+    @property
+    def enable_semantic_cache(self) -> bool:
+        return self.configuration.enable_semantic_cache
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.configuration.max_concurrency
+
     @property
     def service_urls(self) -> Dict[str, str]:
         urls = {}
@@ -189,7 +216,9 @@ class RouterConfig(BaseModel):
         return False
 
     def accounting_client(self) -> UserClient:
-        return self.accounting.client
+        if self._accounting_client is None:
+            self._accounting_client = self.accounting.client
+        return self._accounting_client
 
     @classmethod
     def load(
@@ -221,6 +250,8 @@ class RouterConfig(BaseModel):
         configuration = RouterConfiguration(
             enable_chat=settings.enable_chat,
             enable_search=settings.enable_search,
+            enable_semantic_cache=settings.enable_semantic_cache,
+            max_concurrency=settings.max_concurrency,
         )
         accounting = AccountingConfig(
             url=settings.accounting_url,
@@ -0,0 +1,130 @@
+"""Client-side rate limiting for upstream LLM providers."""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Mapping, Optional
+
+
+# Units accepted in durations such as "1s", "6m0s" or "250ms"
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Longest wait honoured from provider headers, so a huge Retry-After can't
+# hold a request (and its open payment transfer) indefinitely
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+class TokenBucket:
+    """Token bucket that refills continuously up to a fixed capacity."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` tokens are available and consume them."""
+        # Requests larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.refill_per_second)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the next `seconds`."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+
+class RateLimiter:
+    """Limits concurrency, requests per minute and tokens per minute."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """Hold a concurrency slot once request and token budgets allow it."""
+        async with self._semaphore:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            yield
+
+    def pause(self, seconds: float) -> None:
+        """Back off all callers, e.g. after the provider answered 429."""
+        self.request_bucket.pause(seconds)
+        self.token_bucket.pause(seconds)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse a duration like "20ms", "1.5s" or "6m0s" into seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Return how long the provider asked us to wait, if it said so.
+
+    Looks at `retry-after` (seconds or HTTP date) first, then at the
+    `x-ratelimit-reset-tokens` and `x-ratelimit-reset-requests` durations.
+    The result is clamped to `[0, MAX_RETRY_AFTER_SECONDS]`.
+    """
+    seconds = None
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        seconds = _parse_duration(retry_after)
+        if seconds is None:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                retry_at = None
+            if retry_at is not None:
+                # Dates with a "-0000" zone parse as naive; they are UTC
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+    if seconds is None:
+        resets = [
+            _parse_duration(headers[name])
+            for name in ("x-ratelimit-reset-tokens", "x-ratelimit-reset-requests")
+            if headers.get(name)
+        ]
+        resets = [reset for reset in resets if reset is not None]
+        if not resets:
+            return None
+        seconds = max(resets)
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
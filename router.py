@@ -1,10 +1,12 @@
 """Router implementation for claude-sonnet-3.5."""
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Union
 from uuid import UUID
 
 from schema import (
+    ChatRequest,
     ChatResponse,
+    ChatResponseChunk,
     GenerationOptions,
     Message,
     SearchOptions,
@@ -15,6 +17,23 @@ from base_services import ChatService, SearchService
 from config import RouterConfig
 from pydantic import EmailStr
 
+# Service implementations are resolved once at import time; the import
+# error is kept so the factory can report the underlying cause
+_chat_import_error: Optional[ImportError] = None
+_search_import_error: Optional[ImportError] = None
+
+try:
+    from chat_service import ChatServiceImpl
+except ImportError as e:
+    ChatServiceImpl = None
+    _chat_import_error = e
+
+try:
+    from search_service import SearchServiceImpl
+except ImportError as e:
+    SearchServiceImpl = None
+    _search_import_error = e
+
 
 class RouterFactory:
     """Factory for creating service instances based on configuration."""
@@ -22,20 +41,20 @@ class RouterFactory:
     @staticmethod
     def create_chat_service(config: RouterConfig) -> ChatService:
         """Create chat service instance."""
-        try:
-            from chat_service import ChatServiceImpl
-            return ChatServiceImpl(config)
-        except ImportError:
-            raise ImportError("Chat service implementation not found")
+        if ChatServiceImpl is None:
+            raise ImportError(
+                "Chat service implementation not found"
+            ) from _chat_import_error
+        return ChatServiceImpl(config)
     
     @staticmethod
     def create_search_service(config: RouterConfig) -> SearchService:
         """Create search service instance."""
-        try:
-            from search_service import SearchServiceImpl
-            return SearchServiceImpl(config)
-        except ImportError:
-            raise ImportError("Search service implementation not found")
+        if SearchServiceImpl is None:
+            raise ImportError(
+                "Search service implementation not found"
+            ) from _search_import_error
+        return SearchServiceImpl(config)
 
 
 class SyftLLMRouter:
@@ -55,7 +74,7 @@ class SyftLLMRouter:
         if self.config.enable_search:
             self.search_service = RouterFactory.create_search_service(self.config)
 
-    def generate_chat(
+    async def generate_chat(
         self,
         model: str,
         messages: List[Message],
@@ -66,7 +85,26 @@ class SyftLLMRouter:
         """Generate a chat response based on conversation history."""
         if not self.chat_service:
             raise NotImplementedError("Chat functionality is not enabled")
-        return self.chat_service.generate_chat(
+        return await self.chat_service.generate_chat(
+            model=model,
+            messages=messages,
+            user_email=user_email,
+            transaction_token=transaction_token,
+            options=options,
+        )
+
+    def generate_chat_stream(
+        self,
+        model: str,
+        messages: List[Message],
+        user_email: EmailStr,
+        transaction_token: Optional[str] = None,
+        options: Optional[GenerationOptions] = None,
+    ) -> AsyncIterator[ChatResponseChunk]:
+        """Stream a chat response as content chunks."""
+        if not self.chat_service:
+            raise NotImplementedError("Chat functionality is not enabled")
+        return self.chat_service.generate_chat_stream(
             model=model,
             messages=messages,
             user_email=user_email,
@@ -74,6 +112,14 @@ class SyftLLMRouter:
             options=options,
         )
 
+    async def generate_chat_many(
+        self, requests: List[ChatRequest]
+    ) -> List[Union[ChatResponse, BaseException]]:
+        """Generate chat responses for a batch of requests concurrently."""
+        if not self.chat_service:
+            raise NotImplementedError("Chat functionality is not enabled")
+        return await self.chat_service.generate_chat_many(requests)
+
     def search_documents(
         self,
         user_email: EmailStr,
@@ -90,3 +136,8 @@ class SyftLLMRouter:
             options=options,
             transaction_token=transaction_token,
         )
+
+    async def aclose(self) -> None:
+        """Release resources held by the configured services."""
+        if self.chat_service:
+            await self.chat_service.aclose()
@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any, Optional
 from uuid import UUID
 from pathlib import Path
@@ -128,6 +129,28 @@ class ChatResponse(SchemaBase):
     cost: Optional[float] = None
 
 
+class ChatResponseChunk(SchemaBase):
+    """A chunk of a streamed chat completion."""
+
+    # The ID of the response this chunk belongs to
+    id: UUID
+
+    # Name of the model used for generation
+    model: str
+
+    # Content generated since the previous chunk
+    delta: str = ""
+
+    # Reason why the generation stopped (final chunk only)
+    finish_reason: Optional[FinishReason] = None
+
+    # Token usage information (final chunk only)
+    usage: Optional[ChatUsage] = None
+
+    # Cost of the request (final chunk only)
+    cost: Optional[float] = None
+
+
 class ChatRequest(SchemaBase):
     """Parameters for chat completion generation."""
 
@@ -149,6 +172,30 @@ class ChatRequest(SchemaBase):
     )
 
 
+class BatchChatRequest(SchemaBase):
+    """A batch of chat completion requests."""
+
+    # The chat requests to run concurrently
+    requests: list[ChatRequest]
+
+
+class BatchChatResult(SchemaBase):
+    """Outcome of a single request in a chat batch."""
+
+    # The chat response, if the request succeeded
+    response: Optional[ChatResponse] = None
+
+    # The error message, if the request failed
+    error: Optional[str] = None
+
+
+class BatchChatResponse(SchemaBase):
+    """Responses for a batch of chat completion requests."""
+
+    # Results in the same order as the batch requests
+    results: list[BatchChatResult]
+
+
 class SearchOptions(SchemaBase):
     """Options for controlling document retrieval process"""
 
@@ -320,6 +367,14 @@ class PublishedMetadata(SchemaBase):
     # Path to RPC schema file
     schema_path: Optional[str] = Field(None, description="Path to RPC schema file")
 
+    @cached_property
+    def services_by_type(self) -> dict[RouterServiceType, ServiceOverview]:
+        """Services indexed by their type; the first service of a type wins."""
+        services_by_type = {}
+        for service in self.services:
+            services_by_type.setdefault(service.type, service)
+        return services_by_type
+
     @classmethod
     def from_path(cls, metadata_path: Path) -> "PublishedMetadata":
         return cls.model_validate_json(metadata_path.read_text())
@@ -32,13 +32,16 @@ class LocalSearchService(SearchService):
         self.rag_url = self.config.get_service_url("search")
         if not self.rag_url:
             raise ValueError("Search service URL not found in configuration")
-        logger.info(f"Initialized local RAG service with URL: {self.rag_url}")
+        logger.info("Initialized local RAG service with URL: {}", self.rag_url)
 
         self.rag_client = httpx.Client(base_url=self.rag_url)
         self.accounting_client: UserClient = self.config.accounting_client()
-        logger.info(f"Initialized accounting client: {self.accounting_client}")
+        logger.info("Initialized accounting client: {}", self.accounting_client)
         self.app_name = self.config.project.name
 
+        # (metadata mtime, pricing) of the last parsed metadata file
+        self._pricing_cache: Optional[tuple[int, Optional[float]]] = None
+
         self._check_if_rag_is_ready()
 
     def _check_if_rag_is_ready(self):
@@ -48,7 +51,7 @@ class LocalSearchService(SearchService):
             response.raise_for_status()
             logger.info("RAG is ready")
         except Exception as e:
-            logger.error(f"RAG is not ready: {e}")
+            logger.error("RAG is not ready: {}", e)
 
     def __make_search_request(self, query: str, limit: int) -> list[dict]:
         """Make a search request to the RAG service."""
@@ -126,18 +129,26 @@ class LocalSearchService(SearchService):
             )
 
         except Exception as e:
-            logger.error(f"Document search failed: {e}")
+            logger.error("Document search failed: {}", e)
             raise e
 
     @property
     def pricing(self) -> float:
-        """Get the pricing for the search service."""
-        if not self.config.metadata_path.exists():
+        """Get the pricing for the search service.
+
+        The metadata file is only re-parsed when its modification time changes.
+        """
+        try:
+            mtime = os.stat(self.config.metadata_path).st_mtime_ns
+        except FileNotFoundError:
             return 0.0
+        if self._pricing_cache is not None and self._pricing_cache[0] == mtime:
+            return self._pricing_cache[1]
         metadata = PublishedMetadata.from_path(self.config.metadata_path)
-        for service in metadata.services:
-            if service.type == RouterServiceType.SEARCH:
-                return service.pricing
+        service = metadata.services_by_type.get(RouterServiceType.SEARCH)
+        pricing = service.pricing if service else None
+        self._pricing_cache = (mtime, pricing)
+        return pricing
 
 
 SearchServiceImpl = LocalSearchService
@@ -11,10 +11,12 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastsyftbox import FastSyftBox
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from fastapi.openapi.utils import get_openapi
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from syft_core.config import SyftClientConfig
 from pathlib import Path
 from pydantic import EmailStr
@@ -22,6 +24,9 @@ from pydantic import EmailStr
 from config import load_config, RunStatus, get_env_settings
 from router import SyftLLMRouter
 from schema import (
+    BatchChatRequest,
+    BatchChatResponse,
+    BatchChatResult,
     ChatResponse,
     SearchRequest,
     ChatRequest,
@@ -131,7 +136,7 @@ async def lifespan(app: FastSyftBox):
         # Initialize router
         global router
         router = SyftLLMRouter(config=config)
-        logger.info(f"Router initialized for project: {config.project_name}")
+        logger.info("Router initialized for project: {}", config.project_name)
 
         # Generate OpenAPI schema
         generate_openapi_schema(app)
@@ -153,13 +158,15 @@ async def lifespan(app: FastSyftBox):
         yield
 
     except Exception as e:
-        logger.error(f"Failed to initialize router: {e}")
+        logger.error("Failed to initialize router: {}", e)
         raise
 
     finally:
         # Optional cleanup logic if needed
         # For example, closing any resources
         logger.info("Application shutting down")
+        if router:
+            await router.aclose()
         config.state.update_router_state(status=RunStatus.STOPPED)
 
 
@@ -218,34 +225,142 @@ async def health_check(request: Request):
     summary="Chat with the router",
     description="Chat with the router",
     responses={200: {"model": ChatResponse}},
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/ChatRequest"}
+                }
+            },
+            "required": True,
+        }
+    },
 )
-async def chat_completion(request: ChatRequest) -> ChatResponse:
+async def chat_completion(request: Request) -> Response:
     """Chat completion endpoint.
 
+    The response is serialized directly, bypassing FastAPI's re-validation
+    of the returned model against `response_model`.
+
+    Args:
+        request (Request): The raw request whose body is a `ChatRequest`
+
+    Returns:
+        Response: The JSON `ChatResponse` from the router
+    """
+    if not router:
+        raise HTTPException(status_code=503, detail="Router not initialized")
+
+    try:
+        chat_request = ChatRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Match FastAPI's own body errors, whose loc starts with "body"
+        raise RequestValidationError(
+            [
+                {**err, "loc": ("body", *err["loc"])}
+                for err in e.errors(include_url=False)
+            ]
+        )
+
+    try:
+        response = await router.generate_chat(
+            user_email=chat_request.user_email,
+            model=chat_request.model,
+            messages=chat_request.messages,
+            options=chat_request.options,
+            transaction_token=chat_request.transaction_token,
+        )
+        return Response(
+            content=response.model_dump_json(by_alias=True),
+            media_type="application/json",
+        )
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error("Chat completion failed: {}", e)
+        raise HTTPException(status_code=500, detail="Chat completion failed")
+
+
+@app.post(
+    "/chat/stream",
+    summary="Stream a chat with the router",
+    description="Stream chat completion chunks as server-sent events",
+)
+async def chat_completion_stream(request: ChatRequest) -> StreamingResponse:
+    """Streaming chat completion endpoint.
+
     Args:
-        user_email (EmailStr): The email of the user making the request
         request (ChatRequest): The request body containing the chat completion parameters
 
     Returns:
-        ChatResponse: The chat completion response from the router
+        StreamingResponse: `ChatResponseChunk` events, terminated by `[DONE]`
     """
     if not router:
         raise HTTPException(status_code=503, detail="Router not initialized")
 
     try:
-        return router.generate_chat(
+        chunks = router.generate_chat_stream(
             user_email=request.user_email,
             model=request.model,
             messages=request.messages,
             options=request.options,
             transaction_token=request.transaction_token,
         )
+        # Pull the first chunk so setup errors still map to an HTTP status
+        first_chunk = await chunks.__anext__()
     except NotImplementedError as e:
         raise HTTPException(status_code=501, detail=str(e))
     except Exception as e:
-        logger.error(f"Chat completion failed: {e}")
+        logger.error("Chat completion stream failed: {}", e)
         raise HTTPException(status_code=500, detail="Chat completion failed")
 
+    async def event_stream():
+        yield f"data: {first_chunk.model_dump_json(by_alias=True)}\n\n"
+        try:
+            async for chunk in chunks:
+                yield f"data: {chunk.model_dump_json(by_alias=True)}\n\n"
+        except Exception as e:
+            logger.error("Chat completion stream failed: {}", e)
+            yield 'data: {"error": "Chat completion failed"}\n\n'
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post(
+    "/chat/batch",
+    response_model=BatchChatResponse,
+    tags=["syftbox"],
+    summary="Chat with the router in batch",
+    description="Run several chat completions concurrently",
+    responses={200: {"model": BatchChatResponse}},
+)
+async def chat_completion_batch(request: BatchChatRequest) -> BatchChatResponse:
+    """Batch chat completion endpoint.
+
+    Args:
+        request (BatchChatRequest): The chat completion requests to run
+
+    Returns:
+        BatchChatResponse: One result per request, in request order
+    """
+    if not router:
+        raise HTTPException(status_code=503, detail="Router not initialized")
+
+    try:
+        responses = await router.generate_chat_many(request.requests)
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    results = []
+    for response in responses:
+        if isinstance(response, BaseException):
+            logger.error("Chat completion in batch failed: {}", response)
+            results.append(BatchChatResult(error="Chat completion failed"))
+        else:
+            results.append(BatchChatResult(response=response))
+    return BatchChatResponse(results=results)
+
 
 def is_port_in_use(port: int) -> bool:
     """Check if a port is in use."""
@@ -283,7 +398,7 @@ async def search_documents(request: SearchRequest):
     except NotImplementedError as e:
         raise HTTPException(status_code=501, detail=str(e))
     except Exception as e:
-        logger.error(f"Document retrieval failed: {e}")
+        logger.error("Document retrieval failed: {}", e)
         raise HTTPException(status_code=500, detail=f"Document retrieval failed {e}")
 
 
@@ -336,7 +451,7 @@ def main():
         # Choose a random port
         args.port = random.randint(10000, 65535)
         logger.warning(
-            f"Port {args.port} is already in use. Using random port: {args.port}"
+            "Port {} is already in use. Using random port: {}", args.port, args.port
         )
 
     os.environ["APP_PORT"] = str(args.port)
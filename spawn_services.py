@@ -5,6 +5,7 @@ Template for implementing custom chat and search service spawning.
 """
 import os
 import argparse
+import asyncio
 import logging
 import subprocess
 import sys
@@ -58,9 +59,9 @@ class CustomServiceManager:
         # Update state
         self._initialize_state()
 
-        logger.info(f"Service Manager initialized for {project_name}")
-        logger.info(f"Chat enabled: {self.enable_chat}")
-        logger.info(f"Search enabled: {self.enable_search}")
+        logger.info("Service Manager initialized for %s", project_name)
+        logger.info("Chat enabled: %s", self.enable_chat)
+        logger.info("Search enabled: %s", self.enable_search)
 
     def _initialize_state(self) -> None:
         """Update state."""
@@ -109,12 +110,19 @@ class CustomServiceManager:
             ]
             
             logger.info("🧪 Testing chat service with a simple request...")
-            test_response = self.chat_service.generate_chat(
-                model="claude-3-haiku",
-                messages=test_messages,
-                user_email="test@example.com",
-                options=GenerationOptions(max_tokens=50)
-            )
+
+            async def _test_chat():
+                try:
+                    return await self.chat_service.generate_chat(
+                        model="claude-3-haiku",
+                        messages=test_messages,
+                        user_email="test@example.com",
+                        options=GenerationOptions(max_tokens=50)
+                    )
+                finally:
+                    await self.chat_service.aclose()
+
+            test_response = asyncio.run(_test_chat())
             
             if test_response and test_response.message.content:
                 logger.info("✅ Chat service test successful")
@@ -128,7 +136,7 @@ class CustomServiceManager:
                 raise Exception("Chat service test failed - no response received")
 
         except Exception as e:
-            logger.error(f"❌ Custom chat service setup failed: {e}")
+            logger.error("❌ Custom chat service setup failed: %s", e)
             self.config.state.update_service_state(
                 "chat", status=RunStatus.FAILED, error=str(e)
             )
@@ -159,7 +167,7 @@ class CustomServiceManager:
             return False
 
         except Exception as e:
-            logger.error(f"❌ Custom search service setup failed: {e}")
+            logger.error("❌ Custom search service setup failed: %s", e)
             self.config.state.update_service_state(
                 "search", status=RunStatus.FAILED, error=str(e)
             )
@@ -173,10 +181,7 @@ class CustomServiceManager:
         self.config.state.update_router_state(status=RunStatus.STOPPED)
 
         # Update service states
-        for service_name in self.config.state.services.keys():
-            self.config.state.update_service_state(
-                service_name, status=RunStatus.STOPPED
-            )
+        self.config.state.bulk_update_services(status=RunStatus.STOPPED)
 
         logger.info("✅ Cleanup completed")
 
@@ -219,7 +224,7 @@ def main():
             return 1
 
     except Exception as e:
-        logger.error(f"💥 Service spawning error: {e}")
+        logger.error("💥 Service spawning error: %s", e)
         return 1
 
 
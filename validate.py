@@ -42,6 +42,48 @@ def test_chat_endpoint():
         print(f"❌ Chat endpoint test failed: {e}")
         return False
 
+def test_chat_payload():
+    """Test the OpenRouter payload only carries options OpenRouter accepts."""
+    try:
+        from chat_service import CustomChatService
+        from schema import GenerationOptions, Message, Role
+
+        payload = CustomChatService._build_payload(
+            "anthropic/claude-3-sonnet",
+            [Message(role=Role.USER, content="Hello, how are you?")],
+            GenerationOptions(max_tokens=50, temperature=0.5, stop_sequences=["\n"]),
+        )
+        if "num_predict" not in payload and payload["max_tokens"] == 50:
+            print("✅ Chat payload test passed")
+            return True
+        else:
+            print(f"❌ Chat payload test failed: {payload}")
+            return False
+    except ImportError as e:
+        print(f"❌ Chat payload test failed: {e}")
+        return False
+
+def test_chat_batch_endpoint():
+    """Test batch chat endpoint if enabled."""
+    try:
+        message = {"role": "user", "content": "Hello, how are you?"}
+        payload = {
+            "requests": [
+                {"userEmail": "test@example.com", "model": "test-model", "messages": [message]},
+                {"userEmail": "test@example.com", "model": "test-model", "messages": [message]},
+            ]
+        }
+        response = requests.post("http://localhost:8000/chat/batch", json=payload, timeout=30)
+        if response.status_code == 200 and len(response.json()["results"]) == 2:
+            print("✅ Batch chat endpoint test passed")
+            return True
+        else:
+            print(f"❌ Batch chat endpoint test failed: {response.status_code}")
+            return False
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Batch chat endpoint test failed: {e}")
+        return False
+
 def test_search_endpoint():
     """Test search endpoint if enabled."""
     try:
@@ -73,11 +115,13 @@ def main():
     test_functions = {
         "test_router_health": test_router_health,
         "test_chat_endpoint": test_chat_endpoint,
+        "test_chat_payload": test_chat_payload,
+        "test_chat_batch_endpoint": test_chat_batch_endpoint,
         "test_search_endpoint": test_search_endpoint
     }
     
     # Run only enabled tests
-    tests = [test_functions[test_name] for test_name in ['test_router_health', 'test_chat_endpoint']]
+    tests = [test_functions[test_name] for test_name in ['test_router_health', 'test_chat_endpoint', 'test_chat_payload', 'test_chat_batch_endpoint']]
     
     passed = 0
     total = len(tests)